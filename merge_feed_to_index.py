@@ -10,6 +10,8 @@ Improvements vs v1:
 - Decade mapping: exact years in index get mapped to a decade tag (1911 -> '1910s') for label/overlap boosts.
 - Optional overrides.csv to force a post_url (and optional image_pos) for stubborn rows.
 - Stronger weighting for date/labels, improved image tie-break.
+- Title similarity via RapidFuzz: full index×post ratio matrices computed up front with process.cdist.
+- JSON Lines: any --index/--meta/--out path ending in .jsonl is read/written one record per line.
 
 Outputs:
   - index.merged.json
@@ -17,7 +19,7 @@ Outputs:
   - merge_report.txt
 
 Usage:
-  pip install tqdm
+  pip install tqdm rapidfuzz numpy ijson orjson
   python merge_feed_to_index_v2.py \
       --index site/index/index.json \
       --meta oldindianphotos_images_meta.json \
@@ -25,13 +27,16 @@ Usage:
       --overrides overrides.csv
 """
 
-import json, re, csv, sys, math
+import re, csv, sys, math
 from pathlib import Path
-from difflib import SequenceMatcher
 from collections import defaultdict
 from urllib.parse import urlparse
 from typing import Dict, Any, List, Tuple, Optional
 from tqdm import tqdm
+from rapidfuzz import fuzz, process
+import numpy as np
+import ijson
+import orjson
 import argparse
 
 # ---------- CLI ----------
@@ -69,6 +74,20 @@ ALLOWED_HOSTS = {
 }
 IMG_EXT_RE = re.compile(r'\.(jpg|jpeg|png|webp|gif)(?:\?|$)', re.I)
 
+# precompiled patterns for the helpers below (called per post / per index row)
+WS_RE = re.compile(r"\s+")
+NON_ALNUM_RE = re.compile(r"[^a-z0-9\s]+")
+NON_ASCII_RE = re.compile(r"[^\x20-\x7E]+")
+DATE_PREFIX_RE = re.compile(r"^\d{4}-\d{2}-\d{2}\s+")
+INDEX_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+YEAR_RE = re.compile(r"^\d{4}$")
+PART_DIGIT_RE = re.compile(r'\bpart\b\s*[-:]?\s*(\d{1,2})\b')
+PART_ROMAN_RE = re.compile(r'\bpart\b\s*[-:]?\s*(i|ii|iii|iv|v|vi|vii|viii|ix|x)\b')
+YEAR_MONTH_URL_RE = re.compile(r"/(\d{4})/(\d{2})/")
+IMG_NUM_RE = re.compile(r"(\d{1,3})\.(?:jpg|jpeg|png|webp|gif)$")
+IMG_STRIP_EXT_RE = re.compile(r"\.(jpg|jpeg|png|webp|gif)$", re.I)
+HTTP_NETLOC_RE = re.compile(r"^https?://([^/?#\[\]\s]*)(?=[/?#]|$)")
+
 # Place/term synonyms (extend as needed)
 SYNONYMS = {
     "bombay": "mumbai",
@@ -88,76 +107,84 @@ SYNONYMS = {
     "hindustan": "india",
 }
 
+# one alternation over all synonym keys: a single regex pass instead of split/lookup/join
+SYN_RE = re.compile(r"\b(?:" + "|".join(map(re.escape, sorted(SYNONYMS, key=len, reverse=True))) + r")\b")
+
 ROMAN_MAP = {"i":1,"ii":2,"iii":3,"iv":4,"v":5,"vi":6,"vii":7,"viii":8,"ix":9,"x":10}
 
 def normalize(s: Optional[str]) -> str:
-    return re.sub(r"\s+"," ",(s or "").strip())
+    return WS_RE.sub(" ",(s or "").strip())
 
 def only_ascii(s: str) -> str:
-    return re.sub(r"[^\x20-\x7E]+"," ",s or "")
+    return NON_ASCII_RE.sub(" ",s or "")
 
 def apply_synonyms_tokenwise(text: str) -> str:
-    toks = re.sub(r"[^a-z0-9\s]"," ", text.lower()).split()
-    out = [SYNONYMS.get(t, t) for t in toks]
-    return " ".join(out)
+    s = WS_RE.sub(" ", NON_ALNUM_RE.sub(" ", text.lower())).strip()
+    return SYN_RE.sub(lambda m: SYNONYMS[m.group(0)], s)
 
 def slugify(text: str) -> str:
     s = normalize(text).lower()
     # Keep "part" tokens; v1 removed them which hurt matching
-    s = re.sub(r"^\d{4}-\d{2}-\d{2}\s+", "", s)  # drop leading date in folder
-    s = re.sub(r"[^a-z0-9\s]+", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
+    s = DATE_PREFIX_RE.sub("", s)  # drop leading date in folder
+    s = NON_ALNUM_RE.sub(" ", s)
+    s = WS_RE.sub(" ", s).strip()
     s = apply_synonyms_tokenwise(s)
     return s
 
 def tokens(s: str) -> List[str]:
-    return [t for t in re.sub(r"[^a-z0-9\s]"," ", s.lower()).split() if len(t)>2]
+    return [t for t in NON_ALNUM_RE.sub(" ", s.lower()).split() if len(t)>2]
 
-def jaccard(a: str, b: str) -> float:
-    A,B=set(tokens(a)), set(tokens(b))
-    if not A or not B: return 0.0
-    return len(A&B)/len(A|B)
+# token -> bit position; token sets become int bitsets so overlap is AND + popcount
+VOCAB: Dict[str,int] = {}
 
-def fuzzy(a: str, b: str) -> float:
-    return SequenceMatcher(None, normalize(a).lower(), normalize(b).lower()).ratio()
+def bitmask(items) -> int:
+    m = 0
+    for t in items:
+        m |= 1 << VOCAB.setdefault(t, len(VOCAB))
+    return m
 
 def extract_part_number(text: str) -> Optional[int]:
     """Find Part indicators: 'Part 3', 'Part - III', '(Part II)' etc."""
     s = text.lower()
-    m = re.search(r'\bpart\b\s*[-:]?\s*(\d{1,2})\b', s)
+    m = PART_DIGIT_RE.search(s)
     if m:
         try: return int(m.group(1))
         except: pass
-    m = re.search(r'\bpart\b\s*[-:]?\s*(i|ii|iii|iv|v|vi|vii|viii|ix|x)\b', s)
+    m = PART_ROMAN_RE.search(s)
     if m:
         return ROMAN_MAP.get(m.group(1), None)
     return None
 
 def extract_year_month_from_post_url(u: str) -> Tuple[Optional[str], Optional[str]]:
-    m = re.search(r"/(\d{4})/(\d{2})/", u)
+    m = YEAR_MONTH_URL_RE.search(u)
     return (m.group(1), m.group(2)) if m else (None, None)
 
 def year_month_from_index_date(d: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
     # expects "YYYY-MM-DD"
-    if not d or not re.match(r"\d{4}-\d{2}-\d{2}", d): return (None,None)
+    if not d or not INDEX_DATE_RE.match(d): return (None,None)
     return d[:4], d[5:7]
 
 def decade_tag(year: Optional[str]) -> Optional[str]:
-    if not year or not re.match(r"^\d{4}$", year): return None
+    if not year or not YEAR_RE.match(year): return None
     return f"{year[:3]}0s"
 
 def number_from_orig_filename(s: Optional[str]) -> Optional[int]:
-    m = re.search(r"(\d{1,3})\.(?:jpg|jpeg|png|webp|gif)$", (s or "").lower())
+    m = IMG_NUM_RE.search((s or "").lower())
     return int(m.group(1)) if m else None
 
 def filename_tokens_from_path(p: str) -> List[str]:
     base = Path(p).name
-    base = re.sub(r"\.(jpg|jpeg|png|webp|gif)$","", base, flags=re.I)
+    base = IMG_STRIP_EXT_RE.sub("", base)
     return tokens(base)
 
+def url_netloc(u: str) -> str:
+    # plain http(s) URLs (all of the meta) skip the general parser; anything unusual still uses urlparse
+    m = HTTP_NETLOC_RE.match(u)
+    return m.group(1) if m else urlparse(u).netloc
+
 def host_ok(u: str) -> bool:
     try:
-        h = urlparse(u).netloc
+        h = url_netloc(u)
         if h in ALLOWED_HOSTS: return True
         if IMG_EXT_RE.search(u): return True
         return False
@@ -171,9 +198,31 @@ def prefer_original(u: str) -> float:
     if "imgmax=0" in u: s += 0.2
     return s
 
+# ---------- JSON / JSON Lines I/O (picked by file extension) ----------
+def iter_rows(path: Path):
+    """Yield records one at a time from a .jsonl file or a top-level JSON array."""
+    with path.open("rb") as fh:
+        if path.suffix == ".jsonl":
+            for line in fh:
+                if line.strip():
+                    yield orjson.loads(line)
+        else:
+            yield from ijson.items(fh, "item", use_float=True)
+
+def write_rows(path: Path, rows: List[Dict[str,Any]]):
+    if path.suffix == ".jsonl":
+        with path.open("wb") as fh:
+            for r in rows:
+                fh.write(orjson.dumps(r, option=orjson.OPT_NON_STR_KEYS))
+                fh.write(b"\n")
+    else:
+        path.write_bytes(orjson.dumps(rows, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+
 # ---------- load data ----------
-index: List[Dict[str,Any]] = json.loads(INDEX_PATH.read_text(encoding="utf-8"))
-meta: List[Dict[str,Any]]  = json.loads(META_PATH.read_text(encoding="utf-8"))
+if INDEX_PATH.suffix == ".jsonl":
+    index: List[Dict[str,Any]] = list(iter_rows(INDEX_PATH))
+else:
+    index = orjson.loads(INDEX_PATH.read_bytes())
 
 # overrides: map (folder,title) -> {post_url, image_pos?}
 overrides = {}
@@ -190,13 +239,12 @@ if OVERRIDES_PATH:
                 pass
             overrides[key] = ov
 
-# group meta by post_url
-from collections import defaultdict
+# group meta by post_url (meta is streamed row by row, never held as one list)
 post_map: Dict[str, Dict[str,Any]] = defaultdict(lambda: {
     "post_title":"", "post_date":"", "labels":[], "source":"", "description":"", "images":[]
 })
 
-for row in meta:
+for row in iter_rows(META_PATH):
     u = row.get("image_url")
     if not u or not host_ok(u):  # filter junk
         continue
@@ -222,92 +270,183 @@ for p in post_map.values():
 posts: List[Dict[str,Any]] = []
 for pu, p in post_map.items():
     y, m = extract_year_month_from_post_url(pu)
+    labels = [apply_synonyms_tokenwise(l) for l in (p["labels"] or [])]
     posts.append({
         "post_url": pu,
         "post_title": p["post_title"],
         "post_slug": slugify(p["post_title"]),
+        "post_title_tokens": set(tokens(p["post_title"])),
+        "post_title_norm_lower": normalize(p["post_title"]).lower(),
         "post_date": p["post_date"],
         "post_y": y, "post_m": m,
         "post_decade": decade_tag(y) if y else None,
-        "labels": [apply_synonyms_tokenwise(l) for l in (p["labels"] or [])],
+        "labels": labels,
+        "labels_joined_lower": " ".join(labels).lower(),
         "source": p["source"],
         "description": p["description"],
         "images": p["images"],
+        # per-image features for best_image()
+        "img_pos": np.array([im["pos"] for im in p["images"]], dtype=np.int64),
+        "img_fname_masks": [bitmask(filename_tokens_from_path(urlparse(im["url"]).path)) for im in p["images"]],
+        "img_prefer": np.array([prefer_original(im["url"]) for im in p["images"]]),
         "post_part": extract_part_number(p["post_title"])
     })
 
+# post_url is the post_map key, so it is unique per post
+posts_by_url: Dict[str, Dict[str,Any]] = {p["post_url"]: p for p in posts}
+
 # ---------- scoring ----------
-def post_score(index_row: Dict[str,Any], cand: Dict[str,Any]) -> Tuple[float, Dict[str,float]]:
+# Post score for every (index row, post) pair at once, as matrix ops over blocks of index rows:
+#   score = 0.45*jac + 0.35*fuz + dy + dboost + lob + pbonus
+# jac/fuz take the better of folder-vs-post and title-vs-post. argmax keeps the first post on ties.
+SCORE_BLOCK = 1024  # index rows per block; bounds the rows×posts temporaries
+
+def index_features(index_row: Dict[str,Any]) -> Dict[str,Any]:
+    """Per-row inputs for best_posts()."""
     idx_folder = slugify(index_row.get("folder",""))
     idx_title  = slugify(index_row.get("title",""))
-    # strongest of two
-    jac = max(jaccard(idx_folder, cand["post_title"]),
-              jaccard(idx_title,  cand["post_title"]))
-    fuz = max(fuzzy(idx_folder,  cand["post_title"]),
-              fuzzy(idx_title,   cand["post_title"]))
-
-    # date boost
     iy, im = year_month_from_index_date(index_row.get("date"))
-    dy = 0.0
-    if iy and cand["post_y"] and iy == cand["post_y"]:
-        dy += 0.10
-        if im and cand["post_m"] and im == cand["post_m"]:
-            dy += 0.05
-
-    # decade overlap (if index year maps to decade and post labels have decade tokens)
-    dec = decade_tag(iy) if iy else None
-    dboost = 0.0
-    if dec and (dec in " ".join(cand["labels"]).lower() or (cand["post_decade"] and cand["post_decade"] == dec)):
-        dboost = 0.06
-
-    # label overlap with synonyms
-    idx_tags = [apply_synonyms_tokenwise(t) for t in (index_row.get("tags") or [])]
-    lab = cand["labels"]
-    lob = 0.0
-    if idx_tags and lab:
-        inter = len(set(idx_tags) & set(lab))
-        if inter:
-            lob = min(0.10 + 0.03*inter, 0.20)
-
-    # Part matching bonus
-    idx_part = extract_part_number(index_row.get("folder","") + " " + (index_row.get("title","") or ""))
-    pbonus = 0.0
-    if idx_part and cand["post_part"] and idx_part == cand["post_part"]:
-        pbonus = 0.10
-
-    # blend
-    score = (0.45*jac) + (0.35*fuz) + dy + dboost + lob + pbonus
-    return score, {"jac":jac,"fuz":fuz,"dy":dy,"dboost":dboost,"lob":lob,"pbonus":pbonus}
-
-def image_score(index_row: Dict[str,Any], image: Dict[str,Any], guessed_pos: Optional[int]) -> float:
-    s = 0.0
+    return {
+        "folder_toks": set(tokens(idx_folder)),
+        "title_toks":  set(tokens(idx_title)),
+        "folder_norm_lower": normalize(idx_folder).lower(),
+        "title_norm_lower":  normalize(idx_title).lower(),
+        "iy": iy, "im": im,
+        "dec": decade_tag(iy) if iy else None,
+        "tags": {apply_synonyms_tokenwise(t) for t in (index_row.get("tags") or [])},
+        "part": extract_part_number(index_row.get("folder","") + " " + (index_row.get("title","") or "")),
+    }
+
+def as_int(v: Optional[str]) -> int:
+    return int(v) if v else -1
+
+def postings(sets: List[set]) -> Dict[str,np.ndarray]:
+    """Inverted index: item -> columns of the posts that contain it."""
+    inv: Dict[str,List[int]] = defaultdict(list)
+    for j, items in enumerate(sets):
+        for t in items:
+            inv[t].append(j)
+    return {t: np.array(cols, dtype=np.int64) for t, cols in inv.items()}
+
+def overlap_counts(rows: List[set], inv: Dict[str,np.ndarray]) -> np.ndarray:
+    """|row & post| for every (row, post): each row item scatters +1 onto the posts in its
+    posting list (one bincount), instead of a dense rows×vocab×posts matmul."""
+    n = len(posts)
+    hits = [r*n + inv[t] for r, items in enumerate(rows) for t in items if t in inv]
+    if not hits:
+        return np.zeros((len(rows), n))
+    return np.bincount(np.concatenate(hits), minlength=len(rows)*n).reshape(len(rows), n).astype(np.float64)
+
+def jaccard_block(inter: np.ndarray, a_cnt: np.ndarray, p_cnt: np.ndarray) -> np.ndarray:
+    union = a_cnt[:,None] + p_cnt[None,:] - inter
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where((a_cnt[:,None] > 0) & (p_cnt[None,:] > 0), inter/union, 0.0)
+
+def best_posts(feats: List[Dict[str,Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Column of the best-scoring post and its score for every index row (-1 / -1.0 if no posts)."""
+    if not posts:
+        return np.full(len(feats), -1), np.full(len(feats), -1.0)
+
+    tok_inv = postings([c["post_title_tokens"] for c in posts])
+    p_cnt = np.array([len(c["post_title_tokens"]) for c in posts], dtype=np.float64)
+    lab_inv = postings([set(c["labels"]) for c in posts])
+    post_titles = [c["post_title_norm_lower"] for c in posts]
+    py = np.array([as_int(c["post_y"]) for c in posts])
+    pm = np.array([as_int(c["post_m"]) for c in posts])
+    pp = np.array([c["post_part"] or 0 for c in posts])
+    # decade boost per (distinct index decade, post): substring of joined labels or same post decade
+    decades = sorted({f["dec"] for f in feats if f["dec"]})
+    dec_id = {d: k for k, d in enumerate(decades)}
+    DEC = np.array([[d in c["labels_joined_lower"] or c["post_decade"] == d for c in posts] for d in decades],
+                   dtype=bool).reshape(len(decades), len(posts))
+
+    best_col = np.empty(len(feats), dtype=np.int64)
+    best_score = np.empty(len(feats))
+    for lo in tqdm(range(0, len(feats), SCORE_BLOCK), desc="Scoring", unit="blocks"):
+        blk = feats[lo:lo+SCORE_BLOCK]
+        jac = np.maximum(
+            jaccard_block(overlap_counts([f["folder_toks"] for f in blk], tok_inv),
+                          np.array([len(f["folder_toks"]) for f in blk], dtype=np.float64), p_cnt),
+            jaccard_block(overlap_counts([f["title_toks"] for f in blk], tok_inv),
+                          np.array([len(f["title_toks"]) for f in blk], dtype=np.float64), p_cnt))
+        fuz = np.maximum(
+            process.cdist([f["folder_norm_lower"] for f in blk], post_titles,
+                          scorer=fuzz.ratio, dtype=np.float32, workers=-1),
+            process.cdist([f["title_norm_lower"] for f in blk], post_titles,
+                          scorer=fuzz.ratio, dtype=np.float32, workers=-1)) / 100.0
+
+        # date boost
+        iy = np.array([as_int(f["iy"]) for f in blk])[:,None]
+        im = np.array([as_int(f["im"]) for f in blk])[:,None]
+        y_hit = (iy >= 0) & (py >= 0) & (iy == py)
+        dy = np.where(y_hit, 0.10, 0.0) + np.where(y_hit & (im >= 0) & (pm >= 0) & (im == pm), 0.05, 0.0)
+
+        # decade overlap
+        rows_dec = np.array([dec_id.get(f["dec"], -1) for f in blk])
+        dboost = np.zeros_like(dy)
+        has_dec = rows_dec >= 0
+        dboost[has_dec] = np.where(DEC[rows_dec[has_dec]], 0.06, 0.0)
+
+        # label overlap with synonyms
+        inter = overlap_counts([f["tags"] for f in blk], lab_inv)
+        lob = np.where(inter > 0, np.minimum(0.10 + 0.03*inter, 0.20), 0.0)
+
+        # Part matching bonus
+        ip = np.array([f["part"] or 0 for f in blk])[:,None]
+        pbonus = np.where((ip > 0) & (pp > 0) & (ip == pp), 0.10, 0.0)
+
+        # blend
+        score = (0.45*jac) + (0.35*fuz.astype(np.float64)) + dy + dboost + lob + pbonus
+        best_col[lo:lo+len(blk)] = score.argmax(axis=1)
+        best_score[lo:lo+len(blk)] = score[np.arange(len(blk)), best_col[lo:lo+len(blk)]]
+    return best_col, best_score
+
+def best_image(index_row: Dict[str,Any], cand: Dict[str,Any], guessed_pos: Optional[int]) -> Tuple[Optional[Dict[str,Any]], float]:
+    """Score every image of a post at once from its precomputed arrays; first max wins."""
+    if not cand["images"]:
+        return None, -1.0
+    pos = cand["img_pos"]
+    s = np.zeros(len(pos))
     # position match
-    if image["pos"] and guessed_pos and image["pos"] == guessed_pos:
-        s += 0.58
-    elif image["pos"] and guessed_pos:
-        dist = abs(image["pos"] - guessed_pos)
-        s += max(0.0, 0.46 - 0.09*dist)
+    if guessed_pos:
+        dist = np.abs(pos - guessed_pos)
+        s += np.where(pos == 0, 0.0, np.where(dist == 0, 0.58, np.maximum(0.0, 0.46 - 0.09*dist)))
 
     # filename token overlap
-    idx_file_tokens = filename_tokens_from_path(index_row.get("file","") or "")
-    img_file_tokens = filename_tokens_from_path(urlparse(image["url"]).path)
-    if idx_file_tokens and img_file_tokens:
-        inter = len(set(idx_file_tokens) & set(img_file_tokens))
-        if inter:
-            s += min(0.36, 0.18 + 0.10*inter)
+    idx_file_mask = bitmask(filename_tokens_from_path(index_row.get("file","") or ""))
+    if idx_file_mask:
+        inter = np.array([(idx_file_mask & m).bit_count() for m in cand["img_fname_masks"]])
+        s += np.where(inter > 0, np.minimum(0.36, 0.18 + 0.10*inter), 0.0)
 
     # prefer originals
-    s += prefer_original(image["url"])
-    return s
+    s += cand["img_prefer"]
+    k = int(np.argmax(s))
+    return cand["images"][k], float(s[k])
 
 # ---------- merge ----------
+def merged_entry(item: Dict[str,Any], post: Optional[Dict[str,Any]], image_url: Optional[str],
+                 confidence: float, post_url: Optional[str] = None) -> Dict[str,Any]:
+    """Index row + match fields, built in one dict display (index keys keep their position)."""
+    return {
+        **item,
+        "image_url": image_url,
+        "post_url": post["post_url"] if post else post_url,
+        "post_title": post["post_title"] if post else None,
+        "post_labels": post["labels"] if post else None,
+        "post_source": post["source"] if post else None,
+        "post_description": post["description"] if post else None,
+        "match_confidence": confidence,
+    }
+
 merged: List[Dict[str,Any]] = []
 review_rows: List[Dict[str,Any]] = []
 matched = 0
 unmatched = 0
 
 print(f"🔍 Matching {len(index)} index entries against {len(posts)} posts…")
-for item in tqdm(index, desc="Merging", unit="rows"):
+BEST_COL, BEST_SCORE = best_posts([index_features(item) for item in index])
+
+for i, item in enumerate(tqdm(index, desc="Merging", unit="rows")):
     # Overrides?
     key = (normalize(item.get("folder","")), normalize(item.get("title","")))
     if key in overrides and overrides[key].get("post_url"):
@@ -316,15 +455,10 @@ for item in tqdm(index, desc="Merging", unit="rows"):
         forced_pos = overrides[key].get("image_pos")
 
         # find post in our map
-        cand = next((p for p in posts if p["post_url"] == forced_url), None)
+        cand = posts_by_url.get(forced_url)
         if not cand:
             # write as review if override refers to unknown post
-            out = dict(item); out.update({
-                "image_url": None, "post_url": forced_url, "post_title": None,
-                "post_labels": None, "post_source": None, "post_description": None,
-                "match_confidence": 0.0
-            })
-            merged.append(out); unmatched += 1
+            merged.append(merged_entry(item, None, None, 0.0, post_url=forced_url)); unmatched += 1
             review_rows.append({
                 "id": item.get("id"),
                 "folder": item.get("folder"),
@@ -336,25 +470,10 @@ for item in tqdm(index, desc="Merging", unit="rows"):
             continue
 
         # choose image in that post
-        best_img = None
-        best_score = -1.0
         guessed_pos = forced_pos or number_from_orig_filename(item.get("orig_filename"))
-        for im in cand["images"]:
-            sc = image_score(item, im, guessed_pos)
-            if sc > best_score:
-                best_img, best_score = im, sc
-
-        out = dict(item)
-        out.update({
-            "image_url": (best_img["url"] if best_img else None),
-            "post_url": cand["post_url"],
-            "post_title": cand["post_title"],
-            "post_labels": cand["labels"],
-            "post_source": cand["source"],
-            "post_description": cand["description"],
-            "match_confidence": 1.0 if best_img else 0.8
-        })
-        merged.append(out)
+        best_img, _ = best_image(item, cand, guessed_pos)
+
+        merged.append(merged_entry(item, cand, (best_img["url"] if best_img else None), 1.0 if best_img else 0.8))
         matched += 1 if best_img else 0
         if not best_img:
             review_rows.append({
@@ -367,25 +486,13 @@ for item in tqdm(index, desc="Merging", unit="rows"):
             })
         continue
 
-    # Normal flow: score all posts and pick best
-    best_post = None
-    best_p_score = -1.0
-    best_dbg = {}
-
-    for cand in posts:
-        sc, dbg = post_score(item, cand)
-        if sc > best_p_score:
-            best_post, best_p_score, best_dbg = cand, sc, dbg
+    # Normal flow: best post from the score matrices
+    best_post = posts[BEST_COL[i]] if BEST_COL[i] >= 0 else None
+    best_p_score = float(BEST_SCORE[i])
 
     # below threshold → review
     if not best_post or best_p_score < args.post_threshold:
-        out = dict(item)
-        out.update({
-            "image_url": None, "post_url": None, "post_title": None,
-            "post_labels": None, "post_source": None, "post_description": None,
-            "match_confidence": round(best_p_score,4)
-        })
-        merged.append(out)
+        merged.append(merged_entry(item, None, None, round(best_p_score,4)))
         unmatched += 1
         review_rows.append({
             "id": item.get("id"),
@@ -401,25 +508,10 @@ for item in tqdm(index, desc="Merging", unit="rows"):
 
     # choose image within post
     guessed_pos = number_from_orig_filename(item.get("orig_filename"))
-    best_img = None
-    best_i_score = -1.0
-    for im in best_post["images"]:
-        sc = image_score(item, im, guessed_pos)
-        if sc > best_i_score:
-            best_img, best_i_score = im, sc
+    best_img, best_i_score = best_image(item, best_post, guessed_pos)
 
     if not best_img or best_i_score < args.img_threshold:
-        out = dict(item)
-        out.update({
-            "image_url": None,
-            "post_url": best_post["post_url"],
-            "post_title": best_post["post_title"],
-            "post_labels": best_post["labels"],
-            "post_source": best_post["source"],
-            "post_description": best_post["description"],
-            "match_confidence": round(best_p_score,4)
-        })
-        merged.append(out)
+        merged.append(merged_entry(item, best_post, None, round(best_p_score,4)))
         unmatched += 1
         review_rows.append({
             "id": item.get("id"),
@@ -435,22 +527,13 @@ for item in tqdm(index, desc="Merging", unit="rows"):
         continue
 
     # success
-    out = dict(item)
-    out.update({
-        "image_url": best_img["url"],
-        "post_url": best_post["post_url"],
-        "post_title": best_post["post_title"],
-        "post_labels": best_post["labels"],
-        "post_source": best_post["source"],
-        "post_description": best_post["description"],
-        "match_confidence": round(min(1.0, (best_p_score*0.65 + best_i_score*0.35)),4)
-    })
-    merged.append(out)
+    merged.append(merged_entry(item, best_post, best_img["url"],
+                               round(min(1.0, (best_p_score*0.65 + best_i_score*0.35)),4)))
     matched += 1
 
 # ---------- write outputs ----------
 OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-OUT_PATH.write_text(json.dumps(merged, ensure_ascii=False, indent=2), encoding="utf-8")
+write_rows(OUT_PATH, merged)
 
 with REVIEW_PATH.open("w", newline="", encoding="utf-8") as f:
     w = csv.DictWriter(f, fieldnames=[
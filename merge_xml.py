@@ -1,4 +1,6 @@
-import xmltodict, json, glob, os
+import lxml.etree as ET, orjson, glob, os
+
+ATOM_ENTRY = "{http://www.w3.org/2005/Atom}entry"
 
 # find all feed XMLs inside feeds/
 feeds_dir = os.path.join(os.getcwd(), "feeds")
@@ -8,21 +10,67 @@ if not files:
     print("❌ No feed XML files found inside /feeds folder.")
     exit(1)
 
-all_entries = []
-for f in files:
-    print(f"Processing {os.path.basename(f)} ...")
-    with open(f, "r", encoding="utf-8") as fh:
-        data = xmltodict.parse(fh.read())
-        entries = data.get("feed", {}).get("entry", [])
-        if isinstance(entries, dict):
-            entries = [entries]
-        all_entries.extend(entries)
-
-print(f"\n✅ Total posts combined: {len(all_entries)}")
-
 # save combined JSON next to feeds folder
 out_path = os.path.join(os.getcwd(), "feed.json")
-with open(out_path, "w", encoding="utf-8") as fo:
-    json.dump(all_entries, fo, ensure_ascii=False, indent=2)
+
+def qname(name, nsmap):
+    """'{uri}local' -> 'prefix:local' as written in the feed (xmltodict keeps prefixes, not URIs)."""
+    if name[0] != "{":
+        return name
+    uri, local = name[1:].split("}", 1)
+    for prefix, u in nsmap.items():
+        if u == uri:
+            return f"{prefix}:{local}" if prefix else local
+    return local
+
+def to_dict(elem):
+    """Element -> the same value xmltodict.parse() gives it ('@attr', '#text', repeated tags -> list)."""
+    d = {}
+    parent = elem.getparent()
+    inherited = parent.nsmap if parent is not None else {}
+    for prefix, uri in elem.nsmap.items():
+        if inherited.get(prefix) != uri:
+            d["@xmlns:" + prefix if prefix else "@xmlns"] = uri
+    for k, v in elem.attrib.items():
+        d["@" + qname(k, elem.nsmap)] = v
+    text = [elem.text or ""]
+    for child in elem:
+        text.append(child.tail or "")
+        if not isinstance(child.tag, str):  # comments / processing instructions
+            continue
+        key, value = qname(child.tag, child.nsmap), to_dict(child)
+        if key not in d:
+            d[key] = value
+        elif isinstance(d[key], list):
+            d[key].append(value)
+        else:
+            d[key] = [d[key], value]
+    text = "".join(text).strip() or None
+    if not d:
+        return text
+    if text is not None:
+        d["#text"] = text
+    return d
+
+# Entries are streamed with lxml iterparse: each <entry> is converted once it closes, written out,
+# then cleared (with its already-written siblings) so memory stays at one entry per feed.
+# The output is byte-identical to json.dump(all_entries, indent=2) of the xmltodict entries.
+total = 0
+
+with open(out_path, "wb") as fo:
+    for f in files:
+        print(f"Processing {os.path.basename(f)} ...")
+        # recover=True: like xmltodict, accept prefixes (gd:, georss:) the feed never declared
+        for _, elem in ET.iterparse(f, events=("end",), tag=ATOM_ENTRY, recover=True, huge_tree=True):
+            body = orjson.dumps(to_dict(elem), option=orjson.OPT_INDENT_2)
+            fo.write(b"[\n" if total == 0 else b",\n")
+            fo.write(b"\n".join(b"  " + line for line in body.split(b"\n")))
+            total += 1
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+    fo.write(b"\n]" if total else b"[]")
+
+print(f"\n✅ Total posts combined: {total}")
 
 print(f"✅ Saved combined file at: {out_path}")
@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 # process_images.py — streamlined, default paths, smart title/year/tag extraction
 from pathlib import Path
-import os, re, json, shutil, sys
+import os, io, re, shutil, sys
+from concurrent.futures import ProcessPoolExecutor
+import orjson
 from PIL import Image, UnidentifiedImageError
 from tqdm import tqdm
 
@@ -10,19 +12,26 @@ INPUT_ROOT = Path("/Users/dipanshudaga/My Projects/Scraped Photos").expanduser()
 OUT_ROOT = Path("site").resolve()
 IMAGE_DIR = OUT_ROOT / "images"
 THUMB_DIR = OUT_ROOT / "thumbs"
+INDEX_PATH = OUT_ROOT / "index.json"  # the site fetches this as one array; a .jsonl name writes one record per line
 THUMB_MAX = 400
-ALLOWED_EXT = {".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp"}
+ALLOWED_EXT = {"jpg", "jpeg", "png", "webp", "gif", "bmp"}  # matched against the name after its last dot
 OVERWRITE = True
 LIMIT = 0  # 0 = all
+WORKERS = os.cpu_count() or 1  # processes for copy + thumbnail
 
-# ===== KeyBERT if available =====
-try:
-    from keybert import KeyBERT
-    KB_MODEL = KeyBERT(model='all-MiniLM-L6-v2')
-    KB_AVAILABLE = True
-except Exception:
-    KB_MODEL = None
-    KB_AVAILABLE = False
+# ===== KeyBERT if available (loaded in the main process only; pool workers never tag) =====
+KB_MODEL = None
+KB_AVAILABLE = False
+
+def load_keybert():
+    global KB_MODEL, KB_AVAILABLE
+    try:
+        from keybert import KeyBERT
+        KB_MODEL = KeyBERT(model='all-MiniLM-L6-v2')
+        KB_AVAILABLE = True
+    except Exception:
+        KB_MODEL = None
+        KB_AVAILABLE = False
 
 # ===== regex helpers =====
 date_prefix_re = re.compile(r'^\s*(?P<date>\d{4}-\d{2}-\d{2})\s+(?P<title>.+)$')
@@ -105,108 +114,169 @@ def heuristic_tags(title, max_tags=6):
             if len(out)>=max_tags: break
     return out
 
-def smart_tags_keybert(title, max_tags=6):
-    if not title or KB_MODEL is None:
-        return heuristic_tags(title, max_tags)
-    kw = KB_MODEL.extract_keywords(title, keyphrase_ngram_range=(1,2), stop_words='english', top_n=max_tags)
-    tags=[]
-    for word,score in kw:
-        clean_word = re.sub(r'[^A-Za-z0-9\s\-]', '', word).strip().lower()
-        if clean_word and clean_word not in _STOPWORDS and len(clean_word)>2:
-            tags.append(clean_word)
-    return list(dict.fromkeys(tags))[:max_tags]
+def smart_tags_keybert_batch(titles, max_tags=6):
+    """KeyBERT tags for many titles at once -> {title: tags}.
+    One extract_keywords call embeds all titles (and all candidate phrases) in batches on
+    whatever device sentence-transformers picked, instead of one tiny encode per folder."""
+    if KB_MODEL is None:
+        return {t: heuristic_tags(t, max_tags) for t in titles}
+    docs = list(dict.fromkeys(t for t in titles if t))
+    out = {t: heuristic_tags(t, max_tags) for t in titles if not t}
+    if not docs:
+        return out
+    kws = KB_MODEL.extract_keywords(docs, keyphrase_ngram_range=(1,2), stop_words='english', top_n=max_tags)
+    if len(docs) == 1:  # KeyBERT returns a flat list for a single document
+        kws = [kws]
+    for title, kw in zip(docs, kws):
+        tags=[]
+        for word,score in kw:
+            clean_word = re.sub(r'[^A-Za-z0-9\s\-]', '', word).strip().lower()
+            if clean_word and clean_word not in _STOPWORDS and len(clean_word)>2:
+                tags.append(clean_word)
+        out[title] = list(dict.fromkeys(tags))[:max_tags]
+    return out
 
 def filter_tags_remove_part(tags_list):
     return [t for t in (tags_list or []) if not re.match(r'(?i)^part[\divx\-]*$', t)]
 
-# ===== prepare output dirs =====
-if not INPUT_ROOT.exists() or not INPUT_ROOT.is_dir():
-    sys.exit(1)
-
-if OVERWRITE and OUT_ROOT.exists():
-    shutil.rmtree(OUT_ROOT)
-OUT_ROOT.mkdir(parents=True, exist_ok=True)
-IMAGE_DIR.mkdir(parents=True, exist_ok=True)
-THUMB_DIR.mkdir(parents=True, exist_ok=True)
-
-# ===== main processing =====
-folders = sorted([d for d in INPUT_ROOT.iterdir() if d.is_dir()])
-index=[]; global_id=0
-
-for folder in tqdm(folders, desc="folders", unit="f"):
-    folder_name = folder.name
-    title_raw, date, year = clean_title(folder_name)
-    display_title_base = display_title_strip_part(title_raw, year)
-    tags_raw = (smart_tags_keybert(title_raw) if KB_AVAILABLE else heuristic_tags(title_raw))
-    tags_filtered = filter_tags_remove_part(tags_raw)
-    # include year as tag if present and not already
-    if year:
-        y_norm = year.lower()
-        if y_norm not in tags_filtered:
-            tags_filtered.insert(0, y_norm)
-
-    files = sorted([p for p in folder.iterdir() if p.is_file() and p.suffix.lower() in ALLOWED_EXT])
-    if not files: continue
-
-    for p in files:
-        global_id += 1
-        orig_fname = p.name
-        post_slug = slug_for_folder_keep_part(folder_name)
-        image_name_flat = f"{post_slug}__{orig_fname}"
-        thumb_name_flat = image_name_flat
-        if not thumb_name_flat.lower().endswith(('.jpg', '.jpeg')):
-            thumb_name_flat = Path(thumb_name_flat).with_suffix('.jpg').name
-
-        dest_full = IMAGE_DIR / image_name_flat
-        dest_thumb = THUMB_DIR / thumb_name_flat
-
-        if dest_full.exists():
-            base = dest_full.stem + f"_{global_id}"
-            dest_full = dest_full.with_name(base + dest_full.suffix)
-            image_name_flat = dest_full.name
-            thumb_name_flat = Path(image_name_flat).with_suffix('.jpg').name
-            dest_thumb = THUMB_DIR / thumb_name_flat
-
+# ===== per-image work (runs in pool workers) =====
+def process_one(task):
+    """Copy one source image and write its thumbnail; False if the file has to be skipped."""
+    src, dest_full, dest_thumb = task
+    # original: hardlink when on the same filesystem (no bytes copied); otherwise read the source
+    # once, write the copy from that buffer and decode the thumbnail from the same buffer
+    data = None
+    try:
+        os.link(src, dest_full)
+    except OSError:
         try:
-            shutil.copy2(str(p), str(dest_full))
+            data = src.read_bytes()
+            dest_full.write_bytes(data)
+            shutil.copystat(src, dest_full)
         except Exception:
-            continue
+            return False
 
-        try:
-            with Image.open(dest_full) as im:
-                im = im.convert("RGB")
-                im.thumbnail((THUMB_MAX, THUMB_MAX))
-                dest_thumb.parent.mkdir(parents=True, exist_ok=True)
-                im.save(dest_thumb, "JPEG", quality=85)
-        except UnidentifiedImageError:
-            try: dest_full.unlink(missing_ok=True)
-            except: pass
-            continue
-        except Exception:
-            continue
-
-        rel_file = f"images/{image_name_flat}"
-        rel_thumb = f"thumbs/{Path(dest_thumb).name}"
-        entry = {
-            "id": global_id,
-            "title": display_title_base,
-            "folder": folder_name,
-            "orig_filename": orig_fname,
-            "file": rel_file,
-            "thumb": rel_thumb,
-            "tags": tags_filtered,
-            "date": date,
-            "year": year
-        }
-        index.append(entry)
+    try:
+        with Image.open(src if data is None else io.BytesIO(data)) as im:
+            dest_thumb.parent.mkdir(parents=True, exist_ok=True)
+            if im.format == "JPEG" and im.mode == "RGB" and max(im.size) <= THUMB_MAX:
+                # already thumbnail-sized JPEG (only the header was read): use the file itself, no re-encode
+                if data is None: shutil.copyfile(src, dest_thumb)
+                else: dest_thumb.write_bytes(data)
+                return True
+            if im.format == "JPEG":
+                # let libjpeg decode at 1/2..1/8 scale (DCT domain) instead of full resolution
+                im.draft("RGB", (THUMB_MAX*2, THUMB_MAX*2))
+            im = im.convert("RGB")
+            im.thumbnail((THUMB_MAX, THUMB_MAX))
+            im.save(dest_thumb, "JPEG", quality=85)
+    except UnidentifiedImageError:
+        try: dest_full.unlink(missing_ok=True)
+        except: pass
+        return False
+    except Exception:
+        return False
+    return True
+
+def allowed_ext(name):
+    stem, _, ext = name.rpartition(".")
+    return bool(stem) and ext.lower() in ALLOWED_EXT
+
+def main():
+    # ===== prepare output dirs =====
+    if not INPUT_ROOT.exists() or not INPUT_ROOT.is_dir():
+        sys.exit(1)
+
+    if OVERWRITE and OUT_ROOT.exists():
+        shutil.rmtree(OUT_ROOT)
+    OUT_ROOT.mkdir(parents=True, exist_ok=True)
+    IMAGE_DIR.mkdir(parents=True, exist_ok=True)
+    THUMB_DIR.mkdir(parents=True, exist_ok=True)
+
+    load_keybert()
+
+    # ===== plan: names, ids and index entries are assigned here, in order =====
+    # scandir reads the entry type from the directory listing, so no stat() per entry
+    with os.scandir(INPUT_ROOT) as it:
+        folders = [Path(e.path) for e in sorted((e for e in it if e.is_dir()), key=lambda e: e.name)]
+    tasks=[]; entries=[]; used_names=set(); global_id=0
 
+    folder_titles = [clean_title(f.name) for f in folders]
+    keybert_tags = (smart_tags_keybert_batch([t for t, _, _ in folder_titles]) if KB_AVAILABLE else {})
+
+    for folder, (title_raw, date, year) in tqdm(zip(folders, folder_titles), total=len(folders), desc="folders", unit="f"):
+        folder_name = folder.name
+        display_title_base = display_title_strip_part(title_raw, year)
+        tags_raw = (keybert_tags[title_raw] if KB_AVAILABLE else heuristic_tags(title_raw))
+        tags_filtered = filter_tags_remove_part(tags_raw)
+        # include year as tag if present and not already
+        if year:
+            y_norm = year.lower()
+            if y_norm not in tags_filtered:
+                tags_filtered.insert(0, y_norm)
+
+        with os.scandir(folder) as it:
+            files = [Path(e.path) for e in sorted((e for e in it if e.is_file() and allowed_ext(e.name)),
+                                                  key=lambda e: e.name)]
+        if not files: continue
+
+        for p in files:
+            global_id += 1
+            orig_fname = p.name
+            post_slug = slug_for_folder_keep_part(folder_name)
+            image_name_flat = f"{post_slug}__{orig_fname}"
+            thumb_name_flat = image_name_flat
+            if not thumb_name_flat.lower().endswith(('.jpg', '.jpeg')):
+                thumb_name_flat = Path(thumb_name_flat).with_suffix('.jpg').name
+
+            dest_full = IMAGE_DIR / image_name_flat
+            dest_thumb = THUMB_DIR / thumb_name_flat
+
+            # files are written later by the pool, so earlier names of this run are tracked here
+            if image_name_flat in used_names or dest_full.exists():
+                base = dest_full.stem + f"_{global_id}"
+                dest_full = dest_full.with_name(base + dest_full.suffix)
+                image_name_flat = dest_full.name
+                thumb_name_flat = Path(image_name_flat).with_suffix('.jpg').name
+                dest_thumb = THUMB_DIR / thumb_name_flat
+            used_names.add(image_name_flat)
+
+            tasks.append((p, dest_full, dest_thumb))
+            entries.append({
+                "id": global_id,
+                "title": display_title_base,
+                "folder": folder_name,
+                "orig_filename": orig_fname,
+                "file": f"images/{image_name_flat}",
+                "thumb": f"thumbs/{dest_thumb.name}",
+                "tags": tags_filtered,
+                "date": date,
+                "year": year
+            })
+
+            if LIMIT and global_id >= LIMIT:
+                break
         if LIMIT and global_id >= LIMIT:
             break
-    if LIMIT and global_id >= LIMIT:
-        break
 
-with open(OUT_ROOT / "index.json", "w", encoding="utf-8") as fh:
-    json.dump(index, fh, ensure_ascii=False, indent=2)
+    # ===== copy + thumbnail in parallel; map() keeps task order =====
+    index=[]
+    with ProcessPoolExecutor(max_workers=WORKERS) as ex:
+        results = ex.map(process_one, tasks, chunksize=64)
+        for entry, ok in zip(entries, tqdm(results, total=len(tasks), desc="images", unit="img")):
+            if ok:
+                index.append(entry)
+
+    if INDEX_PATH.suffix == ".jsonl":
+        with INDEX_PATH.open("wb") as fh:
+            for e in index:
+                fh.write(orjson.dumps(e))
+                fh.write(b"\n")
+    else:
+        INDEX_PATH.write_bytes(orjson.dumps(index, option=orjson.OPT_INDENT_2))
+
+    # minimal output
+    print(f"OK {len(index)} images -> {OUT_ROOT}")
 
-# minimal output
-print(f"OK {len(index)} images -> {OUT_ROOT}")
+if __name__ == "__main__":
+    main()
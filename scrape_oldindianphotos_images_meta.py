@@ -6,7 +6,9 @@ Goal: collect metadata for ALL images (~7–8k) without downloading files.
 
 How:
 - Discover ALL posts via Blogger JSON feeds (500/page). Fallback to crawl if needed.
-- For each post, fetch desktop HTML and mobile (?m=1).
+- For each post, fetch desktop HTML, plus mobile (?m=1) when the desktop page looks thin or lazy-loaded
+  (--always-mobile to fetch it for every post); posts are scanned concurrently by a thread pool,
+  and each post's mobile/album fetches overlap on a second pool.
 - Extract image URLs aggressively via regex (not just <img>):
     * Any URLs ending with .jpg/.jpeg/.png/.webp/.gif
     * Any URLs on Blogger/Google image hosts (bp.blogspot.com, *.googleusercontent.com), even w/o extension
@@ -14,6 +16,10 @@ How:
 - Expand album links (Google Photos / Picasa / Flickr) by fetching album pages and regex-extracting direct image URLs.
 - Canonicalize Blogger/Google image URLs to originals (/s0/ + imgmax=0).
 - Dedupe globally across size variants and duplicates.
+- Rows are appended to <out>.ndjson as posts finish; a rerun after a crash resumes from it
+  (posts already in it are skipped). At the end it is turned into the array below and removed.
+- Post, mobile and album pages are cached on disk (.scrape_cache/, 7 days), so a rerun only downloads
+  new posts; the feed listing is always fetched live. --refresh empties the cache, --no-cache skips it.
 - Emit ONE JSON ARRAY file, one object PER IMAGE:
   { serial, post_url, post_title, post_date, labels, source, description,
     image_url, alt, caption, position_in_post, album_url }
@@ -22,10 +28,18 @@ Usage:
   python scrape_oldindianphotos_images_meta_deepscan.py -o oldindianphotos_images_meta.json
 """
 
-import argparse, json, re, time, sys
+import argparse, os, re, time, sys, threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from urllib.parse import urljoin, urlparse, urlunparse, parse_qsl, urlencode
+import diskcache
+import ijson
+import orjson
 import requests
-from bs4 import BeautifulSoup
+from urllib3.util.retry import Retry
+import lxml.html
+from lxml import etree
 from tqdm import tqdm
 
 BASE = "https://www.oldindianphotos.in/"
@@ -34,13 +48,47 @@ HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; old-india-photos-meta/1.0)"}
 # File extensions we consider images
 IMG_EXT_RE = re.compile(r'\.(?:jpg|jpeg|png|webp|gif)(?:\?[^"\']*)?$', re.I)
 
+# Precompiled patterns (shared by all scanning threads instead of re's locked pattern cache)
+# - raw HTML image collectors: case-sensitive, run over a lowercased copy of the page (see
+#   lowered_same_length); re.I defeats sre's literal-prefix search and is ~3x slower here
+IMG_TAG_RE = re.compile(r'<img[^>]+(?:src|data-src|data-original|data-lazy-src)=["\']([^"\']+)["\']')
+SRCSET_RE = re.compile(r'srcset=["\']([^"\']+)["\']')
+OG_IMG_RE = re.compile(r'<meta[^>]+property=["\']og:image["\'][^>]+content=["\']([^"\']+)["\']')
+TW_IMG_RE = re.compile(r'<meta[^>]+name=["\']twitter:image["\'][^>]+content=["\']([^"\']+)["\']')
+CSS_URL_RE = re.compile(r'url\(([^)]+)\)')
+A_HREF_RE = re.compile(r'<a[^>]+href=["\']([^"\']+)["\']')
+# - album page collectors: likewise case-sensitive over the lowercased page. They stay four
+#   separate scans: their matches overlap, and one alternation would drop URLs they each find
+ALBUM_IMG_EXT_RE = re.compile(r'(https?://[^"\']+\.(?:jpg|jpeg|png|webp|gif)(?:\?[^"\']*)?)')
+BP_RE = re.compile(r'(https?://(?:[0-9]\.)?bp\.blogspot\.com/[^"\']+)')
+LH_RE = re.compile(r'(https?://(?:lh[3-6]|blogger)\.googleusercontent\.com/[^"\']+)')
+FLICKR_RE = re.compile(r'(https?://live\.staticflickr\.com/[^"\']+\.(?:jpg|jpeg|png|webp|gif))')
+# - host of a plain http(s) URL, without a full urlparse
+HTTP_NETLOC_RE = re.compile(r"^https?://([^/?#\[\]\s]*)(?=[/?#]|$)")
+# - Blogger size segments (blogger_best)
+SIZE_SEG_RE = re.compile(r'/s\d+/')
+WH_SEG_RE = re.compile(r'/w\d+-h\d+(-p)?/')
+# - crawl fallback
+PAGELINK_RE = re.compile(r"(Older Posts|Older|Next|Newer)", re.I)
+POST_PATH_RE = re.compile(r"/\d{4}/\d{2}/.+\.html$")
+# - post metadata (matched against class/id attributes and text nodes of the lxml tree)
+TITLE_CLASS_RE = re.compile("post-title|entry-title", re.I)
+DATE_CLASS_RE = re.compile("date", re.I)
+YEAR_TEXT_RE = re.compile(r"\b\d{4}\b")
+LABEL_CLASS_RE = re.compile("label", re.I)
+LABELS_TEXT_RE = re.compile(r"Labels?:", re.I)
+SOURCE_KEY_RES = tuple(re.compile(rf"^{key}", re.I) for key in ("Source:", "Credit:"))
+BODY_CLASS_RE = re.compile("post-body|entry-content", re.I)
+CONTENT_ID_RE = re.compile("content", re.I)
+FOOTER_TEXT_RE = re.compile("Labels?:|Source:|Credit:", re.I)
+
 # Hosts that often serve Blogger/Google images (sometimes without extensions)
-BLOGGER_HOSTS = {
+BLOGGER_HOSTS = frozenset({
     "bp.blogspot.com",
     "1.bp.blogspot.com", "2.bp.blogspot.com", "3.bp.blogspot.com", "4.bp.blogspot.com",
     "blogger.googleusercontent.com",
     "lh3.googleusercontent.com", "lh4.googleusercontent.com", "lh5.googleusercontent.com", "lh6.googleusercontent.com",
-}
+})
 
 # Album/galleries we attempt to expand
 ALBUM_HOST_HINTS = (
@@ -48,45 +96,94 @@ ALBUM_HOST_HINTS = (
     "plus.google.com", "flickr.com"
 )
 
-# HTTP session with mild retries
+# Post-scanning threads (the work is network-bound, so threads overlap the round-trips)
+WORKERS = 16
+
+# Retries with backoff on connection errors and 429/5xx, done by urllib3 inside the pooled connection
+RETRY = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+
+# One shared keep-alive session; the pool keeps a connection per scanning thread alive
 def make_session():
     s = requests.Session()
     s.headers.update(HEADERS)
-    adapter = requests.adapters.HTTPAdapter(max_retries=3, pool_connections=30, pool_maxsize=30)
+    adapter = requests.adapters.HTTPAdapter(max_retries=RETRY, pool_connections=64, pool_maxsize=max(64, WORKERS * 2))
     s.mount("http://", adapter)
     s.mount("https://", adapter)
+    # with trust_env, every request re-reads proxy/no_proxy, CA-bundle and ~/.netrc settings from the
+    # environment (~30% of requests' per-call CPU); pin the CA bundle once, and resolve proxies once per
+    # host instead (proxies_for, passed by every SESSION.get) so NO_PROXY still applies host by host
+    s.verify = s.merge_environment_settings(BASE, {}, None, None, None)["verify"]
+    s.trust_env = False
     return s
 
 SESSION = make_session()
 
-def fetch(url, expect_json=False, timeout=35, backoff=3):
-    """GET with light retry/backoff."""
-    for i in range(backoff):
-        try:
-            r = SESSION.get(url, timeout=timeout)
-            if r.status_code in (429, 500, 502, 503, 504):
-                time.sleep(0.7 * (i + 1)); continue
-            r.raise_for_status()
-            return r.json() if expect_json else r.text
-        except Exception:
-            time.sleep(0.5 * (i + 1))
-    raise RuntimeError(f"Failed to fetch: {url}")
+@lru_cache(maxsize=None)
+def origin_proxies(origin):
+    """Environment proxies for scheme://host, with NO_PROXY applied ({} when the host bypasses them)."""
+    return requests.utils.get_environ_proxies(origin)
+
+def proxies_for(url):
+    p = urlparse(url)
+    return origin_proxies(f"{p.scheme}://{p.netloc}")
+
+# Per-post fan-out (mobile page + album pages). Separate from the post pool so a post waiting
+# on its own fetches can never starve them; fetch() never submits further work here.
+FETCH_POOL = ThreadPoolExecutor(max_workers=WORKERS * 2)
+
+# On-disk cache of post/album page HTML keyed by URL (diskcache is thread- and process-safe).
+# Opened by main() unless --no-cache; None means every fetch goes to the network.
+CACHE_DIR = ".scrape_cache"
+CACHE_EXPIRE = 7 * 24 * 3600
+PAGE_CACHE = None
+
+def fetch(url, expect_json=False, timeout=35, cached=False):
+    """GET via SESSION (retry/backoff handled by RETRY in the adapter).
+
+    cached=True: serve the page text from PAGE_CACHE, storing it there after a successful GET.
+    """
+    cache = PAGE_CACHE if cached and not expect_json else None
+    if cache is not None:
+        text = cache.get(url)
+        if text is not None:
+            return text
+    try:
+        r = SESSION.get(url, timeout=timeout, stream=False, proxies=proxies_for(url))
+        r.raise_for_status()
+        if expect_json:
+            return orjson.loads(r.content)
+        text = r.text
+    except Exception as e:
+        raise RuntimeError(f"Failed to fetch: {url}") from e
+    if cache is not None:
+        cache.set(url, text, expire=CACHE_EXPIRE)
+    return text
 
 def normalize_page_url(u: str) -> str:
     p = urlparse(u)
     return urlunparse((p.scheme, p.netloc, p.path, "", "", ""))
 
+def url_netloc(u: str) -> str:
+    # plain http(s) URLs (nearly all candidates) skip the general parser; anything unusual still uses urlparse
+    m = HTTP_NETLOC_RE.match(u)
+    return m.group(1) if m else urlparse(u).netloc
+
+@lru_cache(maxsize=200_000)
 def blogger_best(u: str) -> str:
-    """Normalize Blogger/Google image URL to original (try /s0 + ?imgmax=0)."""
+    """Normalize Blogger/Google image URL to original (try /s0 + ?imgmax=0).
+
+    Cached: the same URL comes through the desktop, mobile and album passes and again in main().
+    """
     if not u:
         return u
     # Fix some encoded URLs inside CSS url("...") etc.
     u = u.strip().strip('\'"')
     # Upgrade known size segments to /s0/
-    u2 = re.sub(r'/s\d+/', '/s0/', u)
-    u2 = re.sub(r'/w\d+-h\d+(-p)?/', '/s0/', u2)
-    p = urlparse(u2)
-    if p.netloc in BLOGGER_HOSTS:
+    u2 = SIZE_SEG_RE.sub('/s0/', u)
+    u2 = WH_SEG_RE.sub('/s0/', u2)
+    # only Blogger/Google hosts get the query rewrite, so only they need the full parse
+    if url_netloc(u2) in BLOGGER_HOSTS:
+        p = urlparse(u2)
         qs = dict(parse_qsl(p.query))
         if "imgmax" not in qs:
             qs["imgmax"] = "0"
@@ -95,54 +192,87 @@ def blogger_best(u: str) -> str:
 
 # ----------------- Discovery -----------------
 
+FEED_PAGE_SIZE = 500  # Blogger's max-results cap
+
+def feed_url(start, page_size):
+    return f"{BASE}feeds/posts/default?alt=json&max-results={page_size}&start-index={start}"
+
+def alternate_link(entry):
+    links = entry.get("link", []) or []
+    return next((l.get("href") for l in links if l.get("rel") == "alternate"), None)
+
+def fetch_feed_permalinks(start):
+    """Permalink (or None) of each entry on one feed page; None if the page can't be fetched.
+
+    The page is stream-parsed with ijson as it arrives, one entry at a time, so the whole
+    feed document is never held in memory.
+    """
+    try:
+        url = feed_url(start, FEED_PAGE_SIZE)
+        with SESSION.get(url, timeout=35, stream=True, proxies=proxies_for(url)) as r:
+            r.raise_for_status()
+            r.raw.decode_content = True  # undo gzip/br before parsing
+            return [alternate_link(e) for e in ijson.items(r.raw, "feed.entry.item")]
+    except Exception:
+        return None
+
+def feed_total_results():
+    """Post count from a 1-entry probe of the feed (openSearch$totalResults), 0 if unknown."""
+    try:
+        data = fetch(feed_url(1, 1), expect_json=True)
+        return int(data["feed"]["openSearch$totalResults"]["$t"])
+    except Exception:
+        return 0
+
 def discover_posts_via_feed():
     urls = []
+    # the total is known up front, so every page is requested at once; pages are consumed in
+    # order and discovery stops at the first failed/empty page, as the serial walk did
+    starts = list(range(1, feed_total_results() + 1, FEED_PAGE_SIZE))
+    pages = FETCH_POOL.map(fetch_feed_permalinks, starts)
+    last = starts[-1] if starts else 0
     start = 1
-    page_size = 500
     while True:
-        feed_url = f"{BASE}feeds/posts/default?alt=json&max-results={page_size}&start-index={start}"
-        try:
-            data = fetch(feed_url, expect_json=True)
-        except Exception:
-            break
-        entries = data.get("feed", {}).get("entry", [])
-        if not entries:
+        if start <= last:
+            perms = next(pages)
+        else:
+            # past the probed total (or none was reported): walk on serially until an empty page
+            perms = fetch_feed_permalinks(start)
+            time.sleep(0.25)
+        if not perms:
             break
-        for e in entries:
-            links = e.get("link", []) or []
-            perm = next((l.get("href") for l in links if l.get("rel") == "alternate"), None)
+        for perm in perms:
             if perm:
                 urls.append(normalize_page_url(perm))
-        start += page_size
-        time.sleep(0.25)
+        start += FEED_PAGE_SIZE
     # Dedupe preserve order
-    seen, ordered = set(), []
-    for u in urls:
-        if u not in seen:
-            seen.add(u); ordered.append(u)
-    return ordered
+    return list(dict.fromkeys(urls))
 
 def discover_posts_via_crawl():
-    seen = set(); to_visit = [BASE]; posts = []
-    pagelink_re = re.compile(r"(Older Posts|Older|Next|Newer)", re.I)
+    # queued: every page ever queued, so a "Newer" link back to an already crawled page isn't followed again
+    seen = set(); to_visit = deque([BASE]); queued = {BASE}; posts = []
     while to_visit:
-        page = to_visit.pop(0)
+        page = to_visit.popleft()
         try:
             html = fetch(page)
         except Exception:
             continue
-        soup = BeautifulSoup(html, "html5lib")
-        for a in soup.find_all("a", href=True):
-            href = a["href"]
-            if re.search(r"/\d{4}/\d{2}/.+\.html$", href):
+        root = parse_html(html)
+        older = None
+        for a in root.iter("a"):
+            href = a.get("href")
+            if href is None:
+                continue
+            if POST_PATH_RE.search(href):
                 u = normalize_page_url(urljoin(page, href))
                 if u not in seen:
                     seen.add(u); posts.append(u)
-        older = soup.find("a", string=pagelink_re)
-        if older and older.get("href"):
-            nxt = normalize_page_url(urljoin(page, older["href"]))
-            if nxt not in to_visit:
-                to_visit.append(nxt)
+            if older is None and PAGELINK_RE.search(only_string(a) or ""):
+                older = a
+        if older is not None and older.get("href"):
+            nxt = normalize_page_url(urljoin(page, older.get("href")))
+            if nxt not in queued:
+                queued.add(nxt); to_visit.append(nxt)
         time.sleep(0.05)
     return posts
 
@@ -153,49 +283,139 @@ def discover_all_posts():
     return urls
 
 # ----------------- Post metadata -----------------
+# Pages are parsed once into a plain lxml.html tree (post pages: shared by the metadata and album-link
+# extraction); the helpers below reproduce the BeautifulSoup find/get_text/.string lookups used before.
+
+# strings inside these don't count as text (BeautifulSoup's Script/Stylesheet/TemplateString/ruby)
+NON_TEXT_TAGS = {"script", "style", "template", "rt", "rp"}
+
+# an lxml parser serialises concurrent use, so each scanning thread gets its own
+_tls = threading.local()
 
-def extract_post_metadata(soup):
+def parse_html(html):
+    """Whole-document lxml tree; bytes in so an XHTML '<?xml encoding=...?>' prolog is accepted."""
+    parser = getattr(_tls, "html_parser", None)
+    if parser is None:
+        parser = _tls.html_parser = lxml.html.HTMLParser(encoding="utf-8")
+    try:
+        return lxml.html.document_fromstring(html.encode("utf-8"), parser=parser)
+    except etree.ParserError:  # empty document
+        return lxml.html.Element("html")
+
+def find_el(root, tags=None, attr=None, pattern=None):
+    """First element (document order) with one of tags and, if given, attr matching pattern."""
+    for el in (root.iter(*tags) if tags else root.iter(etree.Element)):
+        if attr is None or pattern.search(el.get(attr) or ""):
+            return el
+    return None
+
+def string_parent(node):
+    """The element a text/comment node belongs to (lxml hangs tail text off the previous sibling)."""
+    parent = node.getparent()
+    return parent.getparent() if getattr(node, "is_tail", False) else parent
+
+def iter_strings(root, pattern):
+    """(node, text) for text and comment nodes under root matching pattern, in document order."""
+    for node in root.xpath(".//text() | .//comment()"):
+        text = node if isinstance(node, str) else (node.text or "")
+        if pattern.search(text):
+            yield node, text
+
+def find_string(root, pattern):
+    """First match of iter_strings (like soup.find(string=pattern)); (None, "") if none."""
+    return next(iter_strings(root, pattern), (None, ""))
+
+def only_string(el):
+    """el's text if it consists of exactly one string, descending through single children (soup .string)."""
+    while True:
+        nodes = ([el.text] if el.text else []) + [n for c in el for n in ((c, c.tail) if c.tail else (c,))]
+        if len(nodes) != 1:
+            return None
+        node = nodes[0]
+        if isinstance(node, str):
+            return node
+        if not isinstance(node.tag, str):  # comment
+            return node.text
+        el = node
+
+def get_text(el, sep=""):
+    """el's stripped, non-empty strings joined with sep (soup get_text(sep, strip=True))."""
+    parts = []
+    for node in el.xpath(".//text()"):
+        parent = string_parent(node)
+        if parent.tag in NON_TEXT_TAGS or any(a.tag in NON_TEXT_TAGS for a in parent.iterancestors()):
+            continue
+        node = node.strip()
+        if node:
+            parts.append(node)
+    return sep.join(parts)
+
+def extract_post_metadata(root):
     """title, date, labels, source, description (clean text)."""
-    title_el = (soup.find(["h1","h2","h3"], class_=re.compile("post-title|entry-title", re.I))
-                or soup.find(["h1","h2","h3"]))
-    title = title_el.get_text(strip=True) if title_el else ""
+    title_el = find_el(root, ("h1","h2","h3"), "class", TITLE_CLASS_RE)
+    if title_el is None: title_el = find_el(root, ("h1","h2","h3"))
+    title = get_text(title_el) if title_el is not None else ""
 
     date_text = ""
-    date_el = soup.find(class_=re.compile("date", re.I)) or soup.find(string=re.compile(r"\b\d{4}\b"))
-    if date_el:
-        date_text = date_el.get_text(strip=True) if hasattr(date_el, "get_text") else str(date_el).strip()
+    date_el = find_el(root, None, "class", DATE_CLASS_RE)
+    if date_el is not None:
+        date_text = get_text(date_el)
+    else:
+        date_text = find_string(root, YEAR_TEXT_RE)[1].strip()
 
     labels = []
-    label_container = soup.find("span", class_=re.compile("label", re.I))
-    if not label_container:
-        lbl = soup.find(string=re.compile(r"Labels?:", re.I))
-        if lbl: label_container = lbl.parent
-    if label_container:
-        labels = [a.get_text(strip=True) for a in label_container.find_all("a")]
+    label_container = find_el(root, ("span",), "class", LABEL_CLASS_RE)
+    if label_container is None:
+        lbl, _ = find_string(root, LABELS_TEXT_RE)
+        if lbl is not None: label_container = string_parent(lbl)
+    if label_container is not None:
+        labels = [get_text(a) for a in label_container.iterdescendants("a")]
 
     source = ""
-    for key in ("Source:", "Credit:"):
-        el = soup.find(string=re.compile(rf"^{key}", re.I))
-        if el:
-            parent = el.parent
-            source = parent.get_text(" ", strip=True) if parent else el.strip()
+    for key_re in SOURCE_KEY_RES:
+        el, _ = find_string(root, key_re)
+        if el is not None:
+            source = get_text(string_parent(el), " ")
             break
 
-    post_body = (soup.find("div", class_=re.compile("post-body|entry-content", re.I))
-                 or soup.find("article")
-                 or soup.find("div", id=re.compile("content", re.I)))
+    post_body = find_el(root, ("div",), "class", BODY_CLASS_RE)
+    if post_body is None: post_body = find_el(root, ("article",))
+    if post_body is None: post_body = find_el(root, ("div",), "id", CONTENT_ID_RE)
     description = ""
-    if post_body:
-        for tag in post_body.find_all(["script","style"]):
-            tag.decompose()
-        for lbl in post_body.find_all(string=re.compile("Labels?:|Source:|Credit:", re.I)):
-            if lbl.parent: lbl.parent.decompose()
-        description = post_body.get_text(" ", strip=True)
-
-    return title, date_text, labels, source, description, (post_body or soup)
+    if post_body is not None:
+        for tag in list(post_body.iterdescendants("script", "style")):
+            tag.drop_tree()
+        # drop the element holding each Labels/Source/Credit string (drop_tree keeps following text);
+        # if that element is the post body itself the description ends up empty
+        body_dropped = False
+        dropped = []
+        for lbl, _ in list(iter_strings(post_body, FOOTER_TEXT_RE)):
+            parent = string_parent(lbl)
+            if body_dropped or any(a in dropped for a in (parent, *parent.iterancestors())):
+                continue  # already removed with an enclosing element
+            if parent is post_body:
+                body_dropped = True
+            else:
+                parent.drop_tree(); dropped.append(parent)
+        description = "" if body_dropped else get_text(post_body, " ")
+
+    return title, date_text, labels, source, description, (post_body if post_body is not None else root)
 
 # ----------------- Image URL extraction -----------------
 
+def lowered_same_length(text):
+    """text.lower() with every index still pointing at the same character of text."""
+    low = text.lower()
+    if len(low) == len(text):
+        return low
+    # rare: a character that lowercases to several (e.g. 'İ') — keep those as-is
+    return "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+def scan_lowered(pattern, raw_html, low):
+    """Group 1 of each match of pattern in low, sliced from raw_html (URLs are case-sensitive)."""
+    for m in pattern.finditer(low):
+        yield raw_html[m.start(1):m.end(1)]
+
 def extract_all_image_urls_from_raw_html(raw_html):
     """
     Aggressive regex-based collector:
@@ -206,32 +426,32 @@ def extract_all_image_urls_from_raw_html(raw_html):
       - any absolute URL ending with image extensions
     """
     urls = set()
+    low = lowered_same_length(raw_html)
 
     # <img ...> src / data-* (quick regex scan)
-    for m in re.finditer(r'<img[^>]+(?:src|data-src|data-original|data-lazy-src)=["\']([^"\']+)["\']', raw_html, re.I):
-        urls.add(m.group(1))
+    for u in scan_lowered(IMG_TAG_RE, raw_html, low):
+        urls.add(u)
 
     # srcset candidates
-    for m in re.finditer(r'srcset=["\']([^"\']+)["\']', raw_html, re.I):
-        for part in m.group(1).split(","):
+    for v in scan_lowered(SRCSET_RE, raw_html, low):
+        for part in v.split(","):
             u = part.strip().split(" ")[0]
             if u: urls.add(u)
 
     # og:image / twitter:image
-    for m in re.finditer(r'<meta[^>]+property=["\']og:image["\'][^>]+content=["\']([^"\']+)["\']', raw_html, re.I):
-        urls.add(m.group(1))
-    for m in re.finditer(r'<meta[^>]+name=["\']twitter:image["\'][^>]+content=["\']([^"\']+)["\']', raw_html, re.I):
-        urls.add(m.group(1))
+    for u in scan_lowered(OG_IMG_RE, raw_html, low):
+        urls.add(u)
+    for u in scan_lowered(TW_IMG_RE, raw_html, low):
+        urls.add(u)
 
     # CSS url(...)
-    for m in re.finditer(r'url\(([^)]+)\)', raw_html, re.I):
-        u = m.group(1).strip(' "\'')
+    for v in scan_lowered(CSS_URL_RE, raw_html, low):
+        u = v.strip(' "\'')
         if u and not u.startswith("data:"):
             urls.add(u)
 
     # <a href="...">
-    for m in re.finditer(r'<a[^>]+href=["\']([^"\']+)["\']', raw_html, re.I):
-        u = m.group(1)
+    for u in scan_lowered(A_HREF_RE, raw_html, low):
         urls.add(u)
 
     # Filter: keep absolute URLs that are either images by ext OR from Blogger hosts
@@ -246,90 +466,88 @@ def extract_all_image_urls_from_raw_html(raw_html):
         # We only trust http(s)
         if not u.startswith("http"):
             continue
-        host = urlparse(u).netloc
-        if host in BLOGGER_HOSTS or IMG_EXT_RE.search(u):
+        # extension test first: a match skips the host lookup
+        if IMG_EXT_RE.search(u) or url_netloc(u) in BLOGGER_HOSTS:
             bu = blogger_best(u)
             if bu not in seen:
                 seen.add(bu); canon.append(bu)
 
     return canon
 
-def extract_album_links(soup, base_url):
+def extract_album_links(root, base_url):
     """Find outbound album/gallery links we should expand."""
     out = []
-    for a in soup.find_all("a", href=True):
-        href = urljoin(base_url, a["href"])
-        host = urlparse(href).netloc
+    for a in root.iter("a"):
+        if a.get("href") is None:
+            continue
+        href = urljoin(base_url, a.get("href"))
+        host = url_netloc(href)
         if any(h in host for h in ALBUM_HOST_HINTS):
             out.append(href)
-    # dedupe
-    seen, ordered = set(), []
-    for u in out:
-        if u not in seen:
-            seen.add(u); ordered.append(u)
-    return ordered
+    # dedupe (preserve order)
+    return list(dict.fromkeys(out))
 
 def extract_album_images(album_url):
     """Fetch public album page and regex-extract direct image URLs."""
     try:
-        raw = fetch(album_url, expect_json=False, timeout=45)
+        raw = fetch(album_url, expect_json=False, timeout=45, cached=True)
     except Exception:
         return []
     urls = set()
+    low = lowered_same_length(raw)
 
     # Direct image extensions
-    for m in re.finditer(r'https?://[^"\']+\.(?:jpg|jpeg|png|webp|gif)(?:\?[^"\']*)?', raw, re.I):
-        urls.add(m.group(0))
+    urls.update(scan_lowered(ALBUM_IMG_EXT_RE, raw, low))
 
     # Blogger/Google image hosts (may not have extension)
-    for m in re.finditer(r'https?://(?:[0-9]\.)?bp\.blogspot\.com/[^"\']+', raw, re.I):
-        urls.add(m.group(0))
-    for m in re.finditer(r'https?://(?:lh[3-6]|blogger)\.googleusercontent\.com/[^"\']+', raw, re.I):
-        urls.add(m.group(0))
+    urls.update(scan_lowered(BP_RE, raw, low))
+    urls.update(scan_lowered(LH_RE, raw, low))
 
     # Flickr static images
-    for m in re.finditer(r'https?://live\.staticflickr\.com/[^"\']+\.(?:jpg|jpeg|png|webp|gif)', raw, re.I):
-        urls.add(m.group(0))
+    urls.update(scan_lowered(FLICKR_RE, raw, low))
 
     # Normalize & dedupe
-    canon = []
-    seen = set()
-    for u in sorted((blogger_best(u) for u in urls), key=len):
-        if u not in seen:
-            seen.add(u); canon.append(u)
-    return canon
+    return list(dict.fromkeys(sorted((blogger_best(u) for u in urls), key=len)))
 
 # ----------------- Per-post processing -----------------
 
-def process_post(post_url, post_delay=0.25):
+def needs_mobile(html, candidates):
+    """The ?m=1 page mostly repeats the desktop images; it's worth a GET only for thin or lazy-loaded pages."""
+    return len(candidates) < 2 or "data-src" in html or "lazy" in html
+
+def process_post(post_url, post_delay=0.25, always_mobile=False):
     """Return dict with post metadata and list of canonical image URLs (deep scan)."""
-    html = fetch(post_url)
-    soup = BeautifulSoup(html, "html5lib")
+    # mobile variant (?m=1) is independent of the desktop page: when it's always wanted, start it right away
+    m_future = FETCH_POOL.submit(fetch, post_url + "?m=1", cached=True) if always_mobile else None
+    html = fetch(post_url, cached=True)
+    root = parse_html(html)
 
-    title, date_text, labels, source, description, content_root = extract_post_metadata(soup)
+    title, date_text, labels, source, description, content_root = extract_post_metadata(root)
 
     # Collect from desktop raw HTML
     candidates = extract_all_image_urls_from_raw_html(html)
+    if m_future is None and needs_mobile(html, candidates):
+        m_future = FETCH_POOL.submit(fetch, post_url + "?m=1", cached=True)
+
+    # Album expansion (Google Photos / Picasa / Flickr); album pages are fetched concurrently
+    album_links = extract_album_links(root, post_url)
+    album_results = FETCH_POOL.map(extract_album_images, album_links)
 
     # Collect from mobile variant (?m=1) which often has simpler markup
-    try:
-        m_html = fetch(post_url + "?m=1")
-        candidates += extract_all_image_urls_from_raw_html(m_html)
-    except Exception:
-        pass
+    if m_future is not None:
+        try:
+            m_html = m_future.result()
+            candidates += extract_all_image_urls_from_raw_html(m_html)
+        except Exception:
+            pass
 
-    # Album expansion (Google Photos / Picasa / Flickr)
-    album_links = extract_album_links(soup, post_url)
     expanded = []
-    for au in album_links:
-        expanded += extract_album_images(au)
+    for imgs in album_results:
+        expanded += imgs
     candidates += expanded
 
     # Per-post dedupe preserve order
-    seen, ordered = set(), []
-    for u in candidates:
-        if u not in seen:
-            seen.add(u); ordered.append(u)
+    ordered = list(dict.fromkeys(candidates))
 
     # Light heuristic for alt/caption/position (best-effort, optional)
     # We won't try to map every URL back to an <img> (deep-scan uses regex),
@@ -361,15 +579,67 @@ def process_post(post_url, post_delay=0.25):
         "images": images,
     }
 
+def try_process_post(post_url, post_delay, always_mobile):
+    """process_post for pool threads: None instead of raising, so one bad post doesn't stop the scan."""
+    try:
+        return process_post(post_url, post_delay=post_delay, always_mobile=always_mobile)
+    except Exception:
+        return None
+
+# ----------------- Output -----------------
+
+def load_partial(ndjson_path):
+    """(done post_urls, seen image_urls, last serial) from an interrupted run's NDJSON rows.
+
+    A torn last line (crash mid-write) is cut off so appending continues on a clean line.
+    """
+    done, seen, serial = set(), set(), 0
+    if not os.path.exists(ndjson_path):
+        return done, seen, serial
+    good = 0
+    with open(ndjson_path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            row = orjson.loads(line)
+            done.add(row["post_url"]); seen.add(row["image_url"]); serial = max(serial, row["serial"])
+            good += len(line)
+    os.truncate(ndjson_path, good)
+    return done, seen, serial
+
+def write_array_from_ndjson(ndjson_path, out_path):
+    """Write the NDJSON rows as one JSON array (same bytes as an indent=2 dump) and swap it in atomically."""
+    tmp = out_path + ".tmp"
+    n = 0
+    with open(ndjson_path, "rb") as src, open(tmp, "wb") as fo:
+        for line in src:
+            body = orjson.dumps(orjson.loads(line), option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            fo.write(b"[\n" if n == 0 else b",\n")
+            fo.write(b"\n".join(b"  " + l for l in body.split(b"\n")))
+            n += 1
+        fo.write(b"\n]" if n else b"[]")
+    os.replace(tmp, out_path)
+    return n
+
 # ----------------- Main -----------------
 
 def main():
     ap = argparse.ArgumentParser(description="Deep-scan metadata-only scraper for oldindianphotos.in")
     ap.add_argument("-o","--out", default="oldindianphotos_images_meta.json", help="Output JSON (single array, one object per IMAGE)")
     ap.add_argument("--limit-posts", type=int, default=0, help="Limit posts (0=all)")
-    ap.add_argument("--post-delay", type=float, default=0.25, help="Delay between post fetches")
+    ap.add_argument("--post-delay", type=float, default=0.25, help="Delay between post fetches (per worker)")
+    ap.add_argument("--workers", type=int, default=WORKERS, help="Posts scanned concurrently")
+    ap.add_argument("--always-mobile", action="store_true", help="Fetch the ?m=1 page for every post, not just thin/lazy-loaded ones")
+    ap.add_argument("--no-cache", action="store_true", help=f"Don't read or write the page cache ({CACHE_DIR}/)")
+    ap.add_argument("--refresh", action="store_true", help="Empty the page cache first, so every page is downloaded again")
     args = ap.parse_args()
 
+    global PAGE_CACHE
+    if not args.no_cache:
+        PAGE_CACHE = diskcache.Cache(CACHE_DIR)
+        if args.refresh:
+            PAGE_CACHE.clear()
+
     print("Discovering posts via Blogger feeds…")
     posts = discover_all_posts()
     print(f"Found {len(posts)} posts")
@@ -377,46 +647,57 @@ def main():
         posts = posts[:args.limit_posts]
         print(f"Limiting to first {len(posts)} posts")
 
-    # Iterate posts and emit a flat list: one dict per image
-    all_images = []
-    global_seen = set()  # dedupe globally by canonical URL
-    serial = 0
-
-    for p_url in tqdm(posts, desc="Deep-scanning posts"):
-        try:
-            info = process_post(p_url, post_delay=args.post_delay)
-        except Exception:
-            # On failure, continue to next post
-            continue
-
-        # Flatten images to one object per image with post metadata
-        for im in info["images"]:
-            url_can = blogger_best(im["image_url"])
-            if url_can in global_seen:
+    # Iterate posts and emit a flat list: one dict per image, appended to the NDJSON file per post
+    ndjson_path = args.out + ".ndjson"
+    done_posts, global_seen, serial = load_partial(ndjson_path)  # global_seen: dedupe by canonical URL
+    if done_posts:
+        print(f"Resuming {ndjson_path}: {len(done_posts)} posts / {len(global_seen)} images already saved")
+    todo = [u for u in posts if u not in done_posts]
+
+    # Posts are fetched in parallel; map() yields results in post order, so serials and the
+    # global dedupe stay deterministic and only this (main) thread touches the shared state.
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as ex, open(ndjson_path, "ab") as out:
+        scan = partial(try_process_post, post_delay=args.post_delay, always_mobile=args.always_mobile)
+        results = ex.map(scan, todo)
+        for info in tqdm(results, total=len(todo), desc="Deep-scanning posts"):
+            if info is None:
+                # On failure, continue to next post
                 continue
-            global_seen.add(url_can)
-            serial += 1
-            all_images.append({
-                "serial": serial,
-                "post_url": info["post_url"],
-                "post_title": info["post_title"],
-                "post_date": info["post_date"],
-                "labels": info["labels"],
-                "source": info["source"],
-                "description": info["description"],
-                "image_url": url_can,
-                "alt": im.get("alt", ""),
-                "caption": im.get("caption", ""),
-                "position_in_post": im.get("position_in_post"),
-                "album_url": im.get("album_url"),
-            })
-
-    with open(args.out, "w", encoding="utf-8") as f:
-        json.dump(all_images, f, ensure_ascii=False, indent=2)
+
+            # Flatten images to one object per image with post metadata
+            rows = []
+            for im in info["images"]:
+                url_can = blogger_best(im["image_url"])
+                if url_can in global_seen:
+                    continue
+                global_seen.add(url_can)
+                serial += 1
+                rows.append(orjson.dumps({
+                    "serial": serial,
+                    "post_url": info["post_url"],
+                    "post_title": info["post_title"],
+                    "post_date": info["post_date"],
+                    "labels": info["labels"],
+                    "source": info["source"],
+                    "description": info["description"],
+                    "image_url": url_can,
+                    "alt": im.get("alt", ""),
+                    "caption": im.get("caption", ""),
+                    "position_in_post": im.get("position_in_post"),
+                    "album_url": im.get("album_url"),
+                }, option=orjson.OPT_NON_STR_KEYS) + b"\n")
+            # one write + flush per post, so a crash leaves whole posts behind
+            out.write(b"".join(rows))
+            out.flush()
+
+    n_images = write_array_from_ndjson(ndjson_path, args.out)
+    os.remove(ndjson_path)
+    if PAGE_CACHE is not None:
+        PAGE_CACHE.close()
 
     print("—" * 60)
     print(f"✅ Saved: {args.out}")
-    print(f"🧮 Posts scanned: {len(posts)} | Images (unique): {len(all_images)}")
+    print(f"🧮 Posts scanned: {len(posts)} | Images (unique): {n_images}")
 
 if __name__ == "__main__":
     main()
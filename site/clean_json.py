@@ -1,20 +1,27 @@
-import json
+import orjson
 import re
+from functools import lru_cache
 
 # Stop words to remove from tags
-STOP_WORDS = {
+STOP_WORDS = frozenset({
     'a', 'an', 'the', 'in', 'on', 'at', 'of', 'to', 'for', 'with', 'from', 'by',
     'view', 'during', 'been', 'were', 'was', 'are', 'is', 'and', 'or', 'but',
     'this', 'that', 'these', 'those'
-}
+})
 
+DATE_PREFIX_RE = re.compile(r'^\d{4}-\d{2}-\d{2}\s+')
+PART_RE = re.compile(r'\s*[-–—]?\s*Part\s*[-–—]?\s*[IVX0-9]+', re.IGNORECASE)
+UPPER_RE = re.compile(r'[A-Z]')
+PUNCT_RE = re.compile(r'[.!?]')
+
+@lru_cache(maxsize=None)
 def clean_title_from_folder(folder_name):
-    """Extract and clean title from folder name"""
+    """Extract and clean title from folder name (cached: every image of a folder shares it)"""
     # Remove date prefix
-    title = re.sub(r'^\d{4}-\d{2}-\d{2}\s+', '', folder_name)
+    title = DATE_PREFIX_RE.sub('', folder_name)
     
     # Remove Part variations
-    title = re.sub(r'\s*[-–—]?\s*Part\s*[-–—]?\s*[IVX0-9]+', ' ', title, flags=re.IGNORECASE)
+    title = PART_RE.sub(' ', title)
     
     # Clean up extra spaces
     title = ' '.join(title.split())
@@ -26,14 +33,14 @@ def is_valid_description(description):
     if not description or not isinstance(description, str):
         return False
     
-    # Minimum 20 words
-    words = description.split()
-    if len(words) < 20:
+    # Minimum 20 words (maxsplit: stop splitting once the 20th word is reached)
+    if len(description.split(None, 19)) < 20:
         return False
     
-    # Check for proper sentences
-    has_capital = any(c.isupper() for c in description)
-    has_punctuation = any(c in '.!?' for c in description)
+    # Check for proper sentences; non-ASCII text falls back to str.isupper for capitals like É
+    has_capital = UPPER_RE.search(description) is not None or (
+        not description.isascii() and any(c.isupper() for c in description))
+    has_punctuation = PUNCT_RE.search(description) is not None
     
     if not (has_capital and has_punctuation):
         return False
@@ -51,15 +58,14 @@ def clean_tags(tags):
     for tag in tags:
         if not tag:
             continue
+        low = tag.lower()
         
-        # Skip stop words
-        if tag.lower() in STOP_WORDS:
+        # Skip stop words and duplicates
+        if low in STOP_WORDS or low in seen:
             continue
         
-        # Remove duplicates
-        if tag.lower() not in seen:
-            cleaned.append(tag)
-            seen.add(tag.lower())
+        cleaned.append(tag)
+        seen.add(low)
     
     return cleaned
 
@@ -67,8 +73,8 @@ def clean_json_data(input_file, output_file):
     """Clean the entire JSON file"""
     print(f"Reading {input_file}...")
     
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    with open(input_file, 'rb') as f:
+        data = orjson.loads(f.read())
     
     print(f"Found {len(data)} entries. Cleaning...")
     
@@ -92,8 +98,8 @@ def clean_json_data(input_file, output_file):
     print(f"Cleaned {cleaned_count} titles")
     print(f"Writing to {output_file}...")
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    with open(output_file, 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
     
     print("Done!")
     print(f"\nSummary:")
@@ -110,7 +116,7 @@ if __name__ == "__main__":
     except FileNotFoundError:
         print(f"Error: Could not find {input_file}")
         print("Please make sure the file exists in the same directory as this script.")
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         print(f"Error: {input_file} is not a valid JSON file")
     except Exception as e:
         print(f"Error: {e}")
\ No newline at end of file